@@ -3,6 +3,7 @@
 from . import utilities
 from . import algorithms
 from .utilities.fitness import create_fitness_function
+from .utilities.fitness import create_batched_fitness_function
 from .algorithms.avoa import avoa
 from .algorithms.dgo import dgo
 from .algorithms.ga import ga
@@ -12,6 +13,7 @@ from .algorithms.stbo import stbo
 
 __all__ = [
     'create_fitness_function',
+    'create_batched_fitness_function',
     'avoa',
     'dgo',
     'ga',
@@ -3,7 +3,6 @@
 import tensorflow as tf
 import metaopts.utilities as mou
 import math
-from copy import deepcopy
 
 
 def avoa(
@@ -50,7 +49,9 @@ def avoa(
     Notes:
 
     * The source code is based on the pseudocode and the equations provided in the paper.
-        
+    * The equations are evaluated for all vultures at once, so the per-vulture loop of the pseudocode is replaced by branch masks.
+    * All model weights are flattened into a single axis, so every equation is a single broadcasted tensor op.
+
     Reference:
 
     * Abdollahzadeh, Benyamin & Soleimanian Gharehchopogh, Farhad & Mirjalili, Seyedali. (2021).
@@ -58,116 +59,144 @@ def avoa(
     Computers & Industrial Engineering. early. 1.10.1016/j.cie.2021.107408.
     """
 
+    @tf.function
+    def update_fitness():
+        mou.print_function_trace('update_fitness')
+        mou.update_population_fitness_flat(
+            model_weights=model_weights,
+            model_fitness_fn=model_fitness_fn,
+            fitness_values=fitness_values,
+            population=P,
+            population_size=N
+        )
+
     @tf.function
     def update_best_vultures():
         mou.print_function_trace('update_best_vultures')
-        best_indices = tf.argsort(fitness_values)[:2]
-        for bv, p in zip(best_vultures, P):
-            bv.assign(tf.gather(p, best_indices))
+        best_indices = tf.math.top_k(-fitness_values, k=2).indices
+        best_vultures.assign(tf.gather(P, best_indices))
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_1():
         mou.print_function_trace('eq_1')
-        reversed = tf.reduce_sum(L) / L
-        logits = tf.math.log(reversed)
-        selected = tf.random.categorical([logits], 1, dtype=tf.int32)
-        for r, bv in zip(R, best_vultures):
-            r.assign(bv[selected[0][0]])
+        u = rng.uniform((N,), 0, 1)
+        selected = tf.cast(u < L1/(L1+L2), dtype=tf.int32)
+        R.assign(tf.gather(best_vultures, selected))
 
-    @tf.function
-    def eq_3():
+    @tf.function(jit_compile=True)
+    def eq_3(gen_t):
         mou.print_function_trace('eq_3')
-        h = tf.random.uniform((), -2, 2)
-        return h * (tf.pow(tf.sin(math.pi/2 * gen/T), w) + tf.cos(math.pi/2 * gen/T) - 1)
+        return tf.pow(tf.sin(math.pi/2 * gen_t/T), w) + tf.cos(math.pi/2 * gen_t/T) - 1
 
-    @tf.function
-    def eq_4():
+    @tf.function(jit_compile=True)
+    def eq_4(gen_t):
         mou.print_function_trace('eq_4')
-        rand_1 = tf.random.uniform((), 0, 1)
-        z = tf.random.uniform((), -1, 1)
-        t = eq_3()
-        F.assign((2*rand_1 + 1) * z * (1 - gen/T) + t)
+        rand_1 = rng.uniform((N,), 0, 1)
+        z = rng.uniform((N,), -1, 1)
+        h = rng.uniform((N,), -2, 2)
+        t = h * eq_3(gen_t)
+        F.assign((2*rand_1 + 1) * z * (1 - gen_t/T) + t)
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_6():
         mou.print_function_trace('eq_6')
         eq_7()
-        for p, r, d in zip(P, R, D):
-            p[i].assign(r - d*F)
+        return R - D*F[:, None]
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_7():
         mou.print_function_trace('eq_7')
-        X = 2 * tf.random.uniform((), 0, 1)
-        for d, r, p in zip(D, R, P):
-            d.assign(tf.abs(X*r - p[i]))
-    
-    @tf.function
+        X = 2 * rng.uniform((N,), 0, 1)
+        D.assign(tf.abs(X[:, None]*R - P))
+
+    @tf.function(jit_compile=True)
     def eq_8():
         mou.print_function_trace('eq_8')
-        rand_2 = tf.random.uniform((), 0, 1)
-        rand_3 = tf.random.uniform((), 0, 1)
-        for p, r in zip(P, R):
-            p[i].assign(r - F + rand_2*((ub-lb)*rand_3 + lb))
+        rand_2 = rng.uniform((N,), 0, 1)
+        rand_3 = rng.uniform((N,), 0, 1)
+        return R - F[:, None] + rand_2[:, None]*((ub-lb)*rand_3[:, None] + lb)
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_10():
         mou.print_function_trace('eq_10')
         eq_7()
-        rand_4 = tf.random.uniform((), 0, 1)
-        for r, p, d in zip(R, P, D):
-            dt = r - p[i] # eq_11
-            p[i].assign(d*(F+rand_4) - dt)
-    
-    @tf.function
+        rand_4 = rng.uniform((N,), 0, 1)
+        dt = R - P # eq_11
+        return D*(F+rand_4)[:, None] - dt
+
+    @tf.function(jit_compile=True)
     def eq_12():
         mou.print_function_trace('eq_12')
-        rand_5 = tf.random.uniform((), 0, 1)
-        rand_6 = tf.random.uniform((), 0, 1)
-        for s, r, p in zip(S, R, P):
-            s[0].assign(r * ((rand_5*p[i]) / (2*math.pi)) * tf.cos(p[i]))
-            s[1].assign(r * ((rand_6*p[i]) / (2*math.pi)) * tf.sin(p[i]))
+        rand_5 = rng.uniform((N,), 0, 1)
+        rand_6 = rng.uniform((N,), 0, 1)
+        S[0].assign(R * ((rand_5[:, None]*P) / (2*math.pi)) * tf.cos(P))
+        S[1].assign(R * ((rand_6[:, None]*P) / (2*math.pi)) * tf.sin(P))
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_13():
         mou.print_function_trace('eq_13')
         eq_12()
-        for p, r, s in zip(P, R, S):
-            p[i].assign(r - (s[0]+s[1]))
+        return R - (S[0]+S[1])
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_15():
         mou.print_function_trace('eq_15')
-        for a, bv, p in zip(A, best_vultures, P):
-            a[0].assign(bv[0] - ((bv[0]*p[i]) / (bv[0]-tf.pow(p[i], 2))) * F)
-            a[1].assign(bv[1] - ((bv[1]*p[i]) / (bv[1]-tf.pow(p[i], 2))) * F)
+        A[0].assign(best_vultures[0] - ((best_vultures[0]*P) / (best_vultures[0]-tf.pow(P, 2))) * F[:, None])
+        A[1].assign(best_vultures[1] - ((best_vultures[1]*P) / (best_vultures[1]-tf.pow(P, 2))) * F[:, None])
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_16():
         mou.print_function_trace('eq_16')
         eq_15()
-        for p, a in zip(P, A):
-            p[i].assign((a[0]+a[1]) / 2)
+        return (A[0]+A[1]) / 2
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_17():
         mou.print_function_trace('eq_17')
         eq_18()
-        for p, r, l in zip(P, R, Levy):
-            dt = r - p[i] # eq_11
-            p[i].assign(r - tf.abs(dt)*F*l)
+        dt = R - P # eq_11
+        return R - tf.abs(dt)*F[:, None]*Levy
 
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_18():
         mou.print_function_trace('eq_18')
-        for l in Levy:
-            u = tf.random.uniform(l.shape, 0, 1)
-            v = tf.random.uniform(l.shape, 0, 1)
-            l.assign(0.01 * ((u*sigma) / tf.pow(tf.abs(v), 1/beta)))
-    
+        u = rng.uniform(Levy.shape, 0, 1)
+        v = rng.uniform(Levy.shape, 0, 1)
+        Levy.assign(0.01 * ((u*sigma) / tf.pow(tf.abs(v), 1/beta)))
+
+    @tf.function(jit_compile=True)
+    def update_vultures(gen_t):
+        mou.print_function_trace('update_vultures')
+
+        # Select R(i) using Eq. (1)
+        eq_1()
+
+        # Update the F using Eq. (4)
+        eq_4(gen_t)
+
+        # Determine which update path each vulture takes
+        abs_F = tf.abs(F)
+        exploration = abs_F >= 1
+        exploitation_1 = tf.logical_and(abs_F < 1, abs_F >= 0.5)
+        use_eq_6 = P1 >= rng.uniform((N,), 0, 1)
+        use_eq_10 = P2 >= rng.uniform((N,), 0, 1)
+        use_eq_16 = P3 >= rng.uniform((N,), 0, 1)
+
+        # Update the location Vulture using Eq. (6), (8), (10), (13), (16) or (17) in one fused select
+        new_p = tf.where(exploration[:, None],
+                         tf.where(use_eq_6[:, None], eq_6(), eq_8()),
+                         tf.where(exploitation_1[:, None],
+                                  tf.where(use_eq_10[:, None], eq_10(), eq_13()),
+                                  tf.where(use_eq_16[:, None], eq_16(), eq_17())))
+        P.assign(new_p)
+
+    def unflatten_population():
+        return [tf.reshape(weights, (population_size,) + mw.shape)
+                for mw, weights in zip(model_weights, tf.split(P, weight_sizes, axis=1))]
+
     def calculate_sigma():
         return pow((math.gamma(1+beta) * math.sin((math.pi*beta) / 2))
-                   / (math.gamma(1 + 2*beta) * beta * 2 * ((beta-1) / 2)),
+                   / (math.gamma(1 + 2*beta) * beta * pow(2, (beta-1) / 2)),
                    1/beta)
 
 
@@ -175,65 +204,72 @@ def avoa(
     N = tf.constant(population_size, dtype=tf.int32)
     T = tf.constant(generation_limit, dtype=tf.float32)
 
+    # Flattened weight layout metadata
+    weight_sizes = [weights.shape.num_elements() for weights in model_weights]
+    total_dim = sum(weight_sizes)
+
     # Initialize the random population Pi (i = 1, 2, ..., N)
-    P = mou.create_population(
+    P = mou.create_flat_population(
         model_weights=model_weights,
-        population_size=N,
+        population_size=population_size,
         transfer_learning=transfer_learning
     )
     fitness_values = tf.Variable(tf.zeros(N, dtype=tf.float32))
 
+    # Dedicated random number generator for the traced equations
+    rng = tf.random.Generator.from_non_deterministic_state()
+
     # Initialize other pseudo-code variables
-    L = tf.constant([L1, L2], dtype=tf.float32)
-    w = tf.constant(w, dtype=tf.float32)
-    P1 = tf.constant(P1, dtype=tf.float32)
-    P2 = tf.constant(P2, dtype=tf.float32)
-    P3 = tf.constant(P3, dtype=tf.float32)
-    lb = tf.constant(lb, dtype=tf.float32)
-    ub = tf.constant(ub, dtype=tf.float32)
-    beta = tf.constant(beta, dtype=tf.float32)
-    sigma = tf.constant(calculate_sigma(), dtype=tf.float32)
-
-    best_vultures = [tf.Variable(tf.zeros((2,) + weights.shape, dtype=tf.float32)) for weights in model_weights]
-    S = deepcopy(best_vultures)
-    A = deepcopy(best_vultures)
-
-    R = [tf.Variable(tf.zeros(weights.shape, dtype=tf.float32)) for weights in model_weights]
-    D = deepcopy(R)
-    Levy = deepcopy(R)
-
-    F = tf.Variable(0.0, dtype=tf.float32)
-    best_fitness = tf.Variable(0.0, dtype=tf.float32)
-    gen = tf.Variable(0.0, dtype=tf.float32)
-    i = tf.Variable(0, dtype=tf.int32)
+    # Hyperparameters stay Python floats so they fold into the traced graphs as compile-time constants
+    L1 = float(L1)
+    L2 = float(L2)
+    w = float(w)
+    P1 = float(P1)
+    P2 = float(P2)
+    P3 = float(P3)
+    lb = float(lb)
+    ub = float(ub)
+    beta = float(beta)
+    sigma = calculate_sigma()
+
+    best_vultures = tf.Variable(tf.zeros((2, total_dim), dtype=tf.float32))
+
+    S = tf.Variable(tf.zeros((2, population_size, total_dim), dtype=tf.float32))
+    A = tf.Variable(tf.zeros((2, population_size, total_dim), dtype=tf.float32))
+
+    R = tf.Variable(tf.zeros((population_size, total_dim), dtype=tf.float32))
+    D = tf.Variable(tf.zeros((population_size, total_dim), dtype=tf.float32))
+    Levy = tf.Variable(tf.zeros((population_size, total_dim), dtype=tf.float32))
+
+    F = tf.Variable(tf.zeros(N, dtype=tf.float32))
+    gen = 0
+
+    # Pre-bind the traced functions to their captured state so the main loop skips `tf.function` dispatch
+    update_fitness = update_fitness.get_concrete_function()
+    update_best_vultures = update_best_vultures.get_concrete_function()
+    update_vultures = update_vultures.get_concrete_function(tf.TensorSpec([], tf.float32))
 
     # Print debug information
     algo_name = 'African Vultures Optimization Algorithm'
     mou.print_algo_start(algo_name)
 
     # while (stopping condition is not met) do
-    while gen <= T:
+    while gen <= generation_limit:
 
         # Calculate the fitness values of Vulture
-        mou.update_population_fitness(
-            model_weights=model_weights,
-            model_fitness_fn=model_fitness_fn,
-            fitness_values=fitness_values,
-            population=P,
-            population_size=N
-        )
+        update_fitness()
 
         # Set PBestVulture1 as the location of Vulture (First best location Best Vulture Category 1)
         # Set PBestVulture2 as the location of Vulture (Second best location Best Vulture Category 2)
         update_best_vultures()
 
         # Update best fitness
-        best_fitness.assign(tf.reduce_min(fitness_values))
+        best_fitness = float(tf.reduce_min(fitness_values))
 
         # Log fitness
         if fitness_log_frequency > 0:
             mou.log_fitness_value(
-                fitness_value=float(best_fitness),
+                fitness_value=best_fitness,
                 log_file_name='{0} fitness'.format(algo_name),
                 max_cache_size=fitness_log_frequency
             )
@@ -241,86 +277,33 @@ def avoa(
         # Save best individual
         if best_individual_save_frequency > 0 and gen % best_individual_save_frequency == 0:
             mou.save_individual(
-                population=P,
+                population=unflatten_population(),
                 individual_index=tf.argmin(fitness_values),
                 file_path='{0} weights'.format(algo_name)
             )
 
         # Print training information
         mou.print_training_status(
-            generation=int(gen),
-            generation_limit=int(T),
-            best_fitness_value=float(best_fitness)
+            generation=gen,
+            generation_limit=generation_limit,
+            best_fitness_value=best_fitness
         )
 
         # Additional stopping condition
         if best_fitness < fitness_limit:
             break
 
-        # for (each Vulture (Pi)) do
-        i.assign(0)
-        while i < N:
-
-            # Select R(i) using Eq. (1)
-            eq_1()
-            
-            # Update the F using Eq. (4)
-            eq_4()
-
-            # if (|F| >= 1) then
-            if tf.abs(F) >= 1:
-
-                # if (P1 >= randP1 ) then
-                if P1 >= tf.random.uniform((), 0, 1):
-
-                    # Update the location Vulture using Eq. (6)
-                    eq_6()
+        # Update the location of each Vulture as one compiled graph
+        update_vultures(tf.constant(gen, dtype=tf.float32))
 
-                else:
-
-                    # Update the location Vulture using Eq. (8)
-                    eq_8()
-            
-            # if (|F| < 1) then
-            else:
-
-                # if (|F| >= 0.5) then
-                if tf.abs(F) >= 0.5:
-
-                    # if (P2 >= randP2 ) then
-                    if P2 >= tf.random.uniform((), 0, 1):
-
-                        # Update the location Vulture using Eq. (10)
-                        eq_10()
-                    
-                    else:
-
-                        # Update the location Vulture using Eq. (13)
-                        eq_13()
-
-                else:
-
-                    # if (P3 >= randP3 ) then
-                    if P3 >= tf.random.uniform((), 0, 1):
-
-                        # Update the location Vulture using Eq. (16)
-                        eq_16()
-                    
-                    else:
-
-                        # Update the location Vulture using Eq. (17)
-                        eq_17()
-
-            i.assign_add(1)
-
-        gen.assign_add(1)
+        gen += 1
 
 
     # Print debug information
     mou.print_algo_end(algo_name)
 
     # Apply best solution to the model
-    mou.apply_best_solution(
+    mou.apply_best_solution_flat(
         model_weights=model_weights,
         model_fitness_fn=model_fitness_fn,
         fitness_values=fitness_values,
@@ -331,7 +314,7 @@ def avoa(
     # Log fitness
     if fitness_log_frequency > 0:
         mou.log_fitness_value(
-            fitness_value=float(best_fitness),
+            fitness_value=best_fitness,
             log_file_name='{0} fitness'.format(algo_name),
             max_cache_size=fitness_log_frequency,
             force_file_write=True
@@ -340,7 +323,7 @@ def avoa(
     # Save best individual
     if best_individual_save_frequency > 0:
         mou.save_individual(
-            population=P,
+            population=unflatten_population(),
             individual_index=tf.argmin(fitness_values),
             file_path='{0} weights'.format(algo_name)
         )
@@ -2,7 +2,6 @@
 
 import tensorflow as tf
 import metaopts.utilities as mou
-from copy import deepcopy
 
 
 def dgo(
@@ -177,7 +176,7 @@ def dgo(
     throw_count = tf.constant(throw_count, dtype=tf.int32)
 
     X_best = [tf.Variable(tf.zeros_like(weights, dtype=tf.float32)) for weights in model_weights]
-    X_worst = deepcopy(X_best)
+    X_worst = [tf.Variable(tf.zeros_like(weights, dtype=tf.float32)) for weights in model_weights]
     F_best = tf.Variable(0.0, dtype=tf.float32)
     F_worst = tf.Variable(0.0, dtype=tf.float32)
 
@@ -187,11 +186,11 @@ def dgo(
     C = tf.Variable(tf.zeros(N, dtype=tf.int32))
 
     S = tf.Variable(tf.zeros((N, throw_count), dtype=tf.int32))
-    best_fitness = tf.Variable(tf.reduce_min(F), dtype=tf.float32)
+    best_fitness = float(tf.reduce_min(F))
     throw_start = tf.Variable(0, dtype=tf.int32)
     throw_end = tf.Variable(0, dtype=tf.int32)
     throw_offset = tf.Variable(0, dtype=tf.int32)
-    gen = tf.Variable(0.0, dtype=tf.float32)
+    gen = 0
 
     # Print debug information
     algo_name = 'Darts Game Optimizer'
@@ -202,9 +201,9 @@ def dgo(
         
         # Print training information
         mou.print_training_status(
-            generation=int(gen),
-            generation_limit=int(generation_limit),
-            best_fitness_value=float(best_fitness)
+            generation=gen,
+            generation_limit=generation_limit,
+            best_fitness_value=best_fitness
         )
 
         # Updating Fbest, Xbest, Fworst, and Xworst using (2) to (5)
@@ -233,12 +232,12 @@ def dgo(
             population=X,
             population_size=N
         )
-        best_fitness.assign(tf.reduce_min(F))
+        best_fitness = float(tf.reduce_min(F))
 
         # Log fitness
         if fitness_log_frequency > 0:
             mou.log_fitness_value(
-                fitness_value=float(best_fitness),
+                fitness_value=best_fitness,
                 log_file_name='{0} fitness'.format(algo_name),
                 max_cache_size=fitness_log_frequency
             )
@@ -251,7 +250,7 @@ def dgo(
                 file_path='{0} weights'.format(algo_name)
             )
 
-        gen.assign_add(1)
+        gen += 1
 
 
     # Print debug information
@@ -269,7 +268,7 @@ def dgo(
     # Log fitness
     if fitness_log_frequency > 0:
         mou.log_fitness_value(
-            fitness_value=float(best_fitness),
+            fitness_value=best_fitness,
             log_file_name='{0} fitness'.format(algo_name),
             max_cache_size=fitness_log_frequency,
             force_file_write=True
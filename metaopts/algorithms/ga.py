@@ -141,14 +141,15 @@ def ga(
     algo_name = 'Genetic Algorithm'
     mou.print_algo_start(algo_name)
 
-    # Initialize generation counter
-    gen = tf.Variable(0, dtype=tf.int32)
+    # Initialize generation counter and best fitness
+    gen = 0
+    best_fitness = float(fitness_values[0])
 
     # Loop until fitness limit is reached or generation limit is exceeded
-    while fitness_values[0] > fitness_limit and gen < generation_limit:
-        
+    while best_fitness > fitness_limit and gen < generation_limit:
+
         # Increment generation counter
-        gen.assign_add(1)
+        gen += 1
 
         # Call genetic operators
         roulette_wheel_selection()
@@ -168,10 +169,13 @@ def ga(
             fitness_values
         )
 
+        # Update best fitness
+        best_fitness = float(fitness_values[0])
+
         # Log fitness
         if fitness_log_frequency > 0:
             mou.log_fitness_value(
-                fitness_value=float(fitness_values[0]),
+                fitness_value=best_fitness,
                 log_file_name='{0} fitness'.format(algo_name),
                 max_cache_size=fitness_log_frequency
             )
@@ -186,9 +190,9 @@ def ga(
 
         # Print training information
         mou.print_training_status(
-            generation=int(gen),
-            generation_limit=int(generation_limit),
-            best_fitness_value=float(fitness_values[0])
+            generation=gen,
+            generation_limit=generation_limit,
+            best_fitness_value=best_fitness
         )
 
 
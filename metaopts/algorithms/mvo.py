@@ -62,14 +62,14 @@ def mvo(
         NI.assign(reversed / tf.reduce_sum(reversed))
 
     @tf.function
-    def update_WEP():
+    def update_WEP(gen_t):
         mou.print_function_trace('update_WEP')
-        WEP.assign(min_const + gen*((max_const-min_const) / L))
+        WEP.assign(min_const + gen_t*((max_const-min_const) / L))
 
     @tf.function
-    def update_TDR():
+    def update_TDR(gen_t):
         mou.print_function_trace('update_TDR')
-        TDR.assign(1 - (tf.pow(gen, 1/p_const) / tf.pow(L, 1/p_const)))
+        TDR.assign(1 - (tf.pow(gen_t, 1/p_const) / tf.pow(L, 1/p_const)))
 
     @tf.function
     def black_hole_white_hole_simulation():
@@ -123,15 +123,14 @@ def mvo(
     p_const = tf.constant(p, dtype=tf.float32)
     lb_const = tf.constant(lower_bound, dtype=tf.float32)
     ub_const = tf.constant(upper_bound, dtype=tf.float32)
-    best_fitness = tf.Variable(0.0, dtype=tf.float32)
-    gen = tf.Variable(0.0, dtype=tf.float32)
+    gen = 0
 
     # Print debug information
     algo_name = 'Multi-Verse Optimizer'
     mou.print_algo_start(algo_name)
 
     # while the end criterion is not satisfied
-    while gen <= L:
+    while gen <= generation_limit:
         
         # Evaluate the fitness of all universes
         mou.update_population_fitness(
@@ -147,12 +146,12 @@ def mvo(
         update_NI()
 
         # Update best fitness
-        best_fitness.assign(tf.reduce_min(fitness_values))
+        best_fitness = float(tf.reduce_min(fitness_values))
 
         # Log fitness
         if fitness_log_frequency > 0:
             mou.log_fitness_value(
-                fitness_value=float(best_fitness),
+                fitness_value=best_fitness,
                 log_file_name='{0} fitness'.format(algo_name),
                 max_cache_size=fitness_log_frequency
             )
@@ -167,9 +166,9 @@ def mvo(
 
         # Print training information
         mou.print_training_status(
-            generation=int(gen),
-            generation_limit=int(L),
-            best_fitness_value=float(best_fitness)
+            generation=gen,
+            generation_limit=generation_limit,
+            best_fitness_value=best_fitness
         )
 
         # Additional stopping condition
@@ -177,8 +176,9 @@ def mvo(
             break
 
         # Update WEP and TDR
-        update_WEP()
-        update_TDR()
+        gen_t = tf.constant(gen, dtype=tf.float32)
+        update_WEP(gen_t)
+        update_TDR(gen_t)
 
         # Efficient black hole and white hole simulation
         black_hole_white_hole_simulation()
@@ -186,7 +186,7 @@ def mvo(
         # Efficient wormhole simulation
         wormhole_simulation()
 
-        gen.assign_add(1)
+        gen += 1
 
 
     # Print debug information
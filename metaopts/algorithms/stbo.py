@@ -50,94 +50,60 @@ def stbo(
     def eq_3():
         return tf.Variable(tf.zeros(N, dtype=tf.float32))
 
-    @tf.function
-    def eq_4(index):
-        mou.print_function_trace('eq_4')
-        CSI = tf.cast(tf.reshape(tf.where(F < F[index]), (-1,)), dtype=tf.int32)
-        if tf.equal(tf.size(CSI), 0):
-            return tf.expand_dims(index, 0)
-        return CSI
-    
-    @tf.function
+    @tf.function(jit_compile=True)
     def eq_5():
         mou.print_function_trace('eq_5')
-        for x, xp in zip(X, XP):
-            shape = tf.shape(x)
-            r = tf.random.uniform(shape, 0, 1, dtype=tf.float32)
-            I = tf.cast(tf.random.uniform(shape, 1, 3, dtype=tf.int32), dtype=tf.float32)
+        r_flat = rng.uniform((N, total_dim), 0, 1, dtype=tf.float32)
+        I_flat = tf.cast(rng.uniform((N, total_dim), 1, 3, dtype=tf.int32), dtype=tf.float32)
+        for x, xp, r, I in zip(X, XP, tf.split(r_flat, weight_sizes, axis=1), tf.split(I_flat, weight_sizes, axis=1)):
+            r = tf.reshape(r, x.shape)
+            I = tf.reshape(I, x.shape)
             xp.assign(x + r*(tf.gather(x, SI) - I*x))
 
-    @tf.function
-    def eq_7_and_8():
+    @tf.function(jit_compile=True)
+    def eq_7_and_8(gen_t):
         mou.print_function_trace('eq_7_and_8')
         for x, xp in zip(X, XP):
-            shape = tf.shape(x)
             m = tf.cast(tf.size(x), dtype=tf.float32)
-            ms = tf.cast(tf.round(1 + gen/(2*T)*m), dtype=tf.int32)
-            SDi = tf.random.shuffle(tf.range(m, dtype=tf.int32))[:ms]
-            x_flat = tf.reshape(x, (-1,))
-            instructors_flat = tf.reshape(tf.gather(x, SI), (-1,))
-            xp_flat = tf.tensor_scatter_nd_update(x_flat, tf.expand_dims(SDi, 1), tf.gather(instructors_flat, SDi))
-            xp.assign(tf.reshape(xp_flat, shape))
+            SD = rng.uniform(x.shape, 0, 1, dtype=tf.float32) < (1 + gen_t/(2*T)*m)/m # eq_7
+            xp.assign(tf.where(SD, tf.gather(x, SI), x))
     
-    @tf.function
-    def eq_10():
+    @tf.function(jit_compile=True)
+    def eq_10(gen_t):
         mou.print_function_trace('eq_10')
-        for x, xp in zip(X, XP):
-            r = tf.random.uniform(x.shape, 0, 1, dtype=tf.float32)
-            xp.assign(tf.clip_by_value(x + (lb + r*(ub-lb))/gen, lb, ub))
+        r_flat = rng.uniform((N, total_dim), 0, 1, dtype=tf.float32)
+        for x, xp, r in zip(X, XP, tf.split(r_flat, weight_sizes, axis=1)):
+            r = tf.reshape(r, x.shape)
+            xp.assign(tf.clip_by_value(x + (lb + r*(ub-lb))/gen_t, lb, ub))
+
+    @tf.function(jit_compile=True)
+    def select_improved_positions():
+        mou.print_function_trace('select_improved_positions')
+        improved_positions = FP < F
+        for x, xp, F_shape in zip(X, XP, improved_shapes):
+            x.assign(tf.where(tf.reshape(improved_positions, F_shape), xp, x))
+        F.assign(tf.where(improved_positions, FP, F))
 
     @tf.function
     def update_improved_positions():
         mou.print_function_trace('update_improved_positions')
         mou.update_population_fitness(model_weights, model_fitness_fn, F, X, N)
         mou.update_population_fitness(model_weights, model_fitness_fn, FP, XP, N)
-        improved_positions = FP < F
-        for x, xp in zip(X, XP):
-            F_shape = tf.concat([[N], tf.ones(tf.rank(x) - 1, dtype=tf.int32)], axis=0)
-            x.assign(tf.where(tf.reshape(improved_positions, F_shape), xp, x))
-        F.assign(tf.where(improved_positions, FP, F))
+        select_improved_positions()
 
     @tf.function
     def update_SI():
         mou.print_function_trace('update_SI')
-        for i in tf.range(N):
-            CSI = eq_4(i)
-            candidate_count = tf.size(CSI)
-            selected_instructor = tf.random.uniform((), 0, candidate_count, dtype=tf.int32)
-            SI[i].assign(CSI[selected_instructor])
-
-    # Adjust N and T
-    N = tf.constant(population_size, dtype=tf.int32)
-    T = tf.constant(generation_limit, dtype=tf.float32)
+        CSI = F[None, :] < F[:, None] # eq_4
+        rand = rng.uniform((N, N), 0, 1, dtype=tf.float32)
+        selected_instructors = tf.argmax(tf.where(CSI, rand, -1.0), axis=1, output_type=tf.int32)
+        has_candidates = tf.reduce_any(CSI, axis=1)
+        SI.assign(tf.where(has_candidates, selected_instructors, tf.range(N)))
 
-    # Initialize the STBO population by (2) and create vector F of the values of the objective function by (3)
-    X = eq_2()
-    F = eq_3()
-    mou.update_population_fitness(
-        model_weights=model_weights,
-        model_fitness_fn=model_fitness_fn,
-        fitness_values=F,
-        population=X,
-        population_size=N
-    )
-
-    # Initialize other pseudo-code variables
-    lb = tf.constant(lb, dtype=tf.float32)
-    ub = tf.constant(ub, dtype=tf.float32)
-    SI = tf.Variable(tf.zeros(N, dtype=tf.int32))
-    XP = [tf.Variable(x) for x in X]
-    FP = tf.Variable(F)
-    best_fitness = tf.Variable(tf.reduce_min(F), dtype=tf.float32)
-    gen = tf.Variable(0.0, dtype=tf.float32)
-
-    # Print debug information
-    algo_name = 'Sewing Training-Based Optimization'
-    mou.print_algo_start(algo_name)
+    @tf.function
+    def generation_step(gen_t):
+        mou.print_function_trace('generation_step')
 
-    # For t = 1 to T
-    while best_fitness > fitness_limit and gen <= T:
-        
         # Phase 1: Training (exploration)
         # Determine the set of candidate training instructors for the ith member by (4)
         # Choose the training instructor SI from CSI to teach sewing the ith STBO member
@@ -152,25 +118,72 @@ def stbo(
         # Phase 2: Imitation of the instructor skills (exploitation)
         # Calculate SD using Equation (7)
         # Calculate the new position of the ith STBO member using Equation (8)
-        eq_7_and_8()
+        eq_7_and_8(gen_t)
 
         # Update the position of the ith STBO member using (9)
         update_improved_positions()
 
         # Phase 3: Practice (exploitation)
         # Calculate the new position for the ith STBO member using (10)
-        eq_10()
+        eq_10(gen_t)
 
         # Update the position of the ith STBO member using (11)
         update_improved_positions()
 
         # Update the best candidate solution
-        best_fitness.assign(tf.reduce_min(F))
+        return tf.reduce_min(F)
+
+    # Adjust N and T
+    N = tf.constant(population_size, dtype=tf.int32)
+    T = tf.constant(generation_limit, dtype=tf.float32)
+
+    # Dedicated random number generator for the traced equations
+    rng = tf.random.Generator.from_non_deterministic_state()
+
+    # Flattened weight layout metadata
+    weight_sizes = [weights.shape.num_elements() for weights in model_weights]
+    total_dim = sum(weight_sizes)
+
+    # Static broadcast shapes of the fitness vector per weight tensor
+    improved_shapes = [[population_size] + [1]*len(weights.shape) for weights in model_weights]
+
+    # Initialize the STBO population by (2) and create vector F of the values of the objective function by (3)
+    X = eq_2()
+    F = eq_3()
+    mou.update_population_fitness(
+        model_weights=model_weights,
+        model_fitness_fn=model_fitness_fn,
+        fitness_values=F,
+        population=X,
+        population_size=N
+    )
+
+    # Initialize other pseudo-code variables
+    lb = tf.constant(lb, dtype=tf.float32)
+    ub = tf.constant(ub, dtype=tf.float32)
+    SI = tf.Variable(tf.zeros(N, dtype=tf.int32))
+    XP = [tf.Variable(tf.zeros_like(x)) for x in X]
+    FP = tf.Variable(tf.zeros_like(F))
+    best_fitness = float(tf.reduce_min(F))
+    gen = 0
+
+    # Pre-bind the traced generation step to its captured state so the main loop skips `tf.function` dispatch
+    generation_step = generation_step.get_concrete_function(tf.TensorSpec([], tf.float32))
+
+    # Print debug information
+    algo_name = 'Sewing Training-Based Optimization'
+    mou.print_algo_start(algo_name)
+
+    # For t = 1 to T
+    while best_fitness > fitness_limit and gen <= generation_limit:
+
+        # Run the training, imitation and practice phases as one compiled graph
+        best_fitness = float(generation_step(tf.constant(gen, dtype=tf.float32)))
 
         # Log fitness
         if fitness_log_frequency > 0:
             mou.log_fitness_value(
-                fitness_value=float(best_fitness),
+                fitness_value=best_fitness,
                 log_file_name='{0} fitness'.format(algo_name),
                 max_cache_size=fitness_log_frequency
             )
@@ -185,12 +198,12 @@ def stbo(
 
         # Print training information
         mou.print_training_status(
-            generation=int(gen),
-            generation_limit=int(T),
-            best_fitness_value=float(best_fitness)
+            generation=gen,
+            generation_limit=generation_limit,
+            best_fitness_value=best_fitness
         )
 
-        gen.assign_add(1)
+        gen += 1
 
 
     # Print debug information
@@ -208,7 +221,7 @@ def stbo(
     # Log fitness
     if fitness_log_frequency > 0:
         mou.log_fitness_value(
-            fitness_value=float(best_fitness),
+            fitness_value=best_fitness,
             log_file_name='{0} fitness'.format(algo_name),
             max_cache_size=fitness_log_frequency,
             force_file_write=True
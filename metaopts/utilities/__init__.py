@@ -1,11 +1,17 @@
 """Utility function module."""
 
 from metaopts.utilities.fitness import create_fitness_function
+from metaopts.utilities.fitness import create_batched_fitness_function
 from metaopts.utilities.fitness import update_individual_fitness
 from metaopts.utilities.fitness import update_population_fitness
+from metaopts.utilities.fitness import update_individual_fitness_flat
+from metaopts.utilities.fitness import update_population_fitness_flat
+from metaopts.utilities.fitness import update_population_fitness_batched
 from metaopts.utilities.population import create_population
+from metaopts.utilities.population import create_flat_population
 from metaopts.utilities.population import sort_population
 from metaopts.utilities.population import apply_best_solution
+from metaopts.utilities.population import apply_best_solution_flat
 from metaopts.utilities.print import print_function_trace
 from metaopts.utilities.print import print_algo_start
 from metaopts.utilities.print import print_algo_end
@@ -17,11 +23,17 @@ from metaopts.utilities.save import load_individual
 
 __all__ = [
     'create_fitness_function',
+    'create_batched_fitness_function',
     'update_individual_fitness',
     'update_population_fitness',
+    'update_individual_fitness_flat',
+    'update_population_fitness_flat',
+    'update_population_fitness_batched',
     'create_population',
+    'create_flat_population',
     'sort_population',
     'apply_best_solution',
+    'apply_best_solution_flat',
     'print_function_trace',
     'print_algo_start',
     'print_algo_end',
@@ -58,6 +58,57 @@ def create_fitness_function(
     return fitness_fn
 
 
+def create_batched_fitness_function(
+        population_model,
+        loss,
+        x,
+        y,
+        batch_size
+    ):
+    """
+    Creates a fitness function which evaluates the whole population with a single forward pass.
+
+    Args:
+        population_model: `callable` - Model replicated over the population, mapping an input batch to predictions with a leading population axis.
+        loss: `tf.keras.losses.Loss` - Loss function created with `reduction='none'`.
+        x: `tf.Tensor` - Input data.
+        y: `tf.Tensor` - Target data.
+        batch_size: `int` - Number of samples per fitness calculation.
+
+    Notes:
+
+    * The population model must read its weights from the population tensors directly, e.g. by contracting the population axis with `tf.einsum`.
+    * The loss must be created with `reduction='none'` so one fitness value per individual can be computed.
+    * The created fitness function returns a rank-1 tensor with one fitness value per individual.
+    """
+
+    # Batch randomization index limit
+    random_limit = x.shape[0] - batch_size + 1
+
+    # Variables for the fitness function
+    batch_start = tf.Variable(0, dtype=tf.int32)
+    batch_end = tf.Variable(0, dtype=tf.int32)
+
+    @tf.function
+    def batched_fitness_fn():
+
+        # Print debug information
+        print_function_trace('batched_fitness_fn')
+
+        # Randomize batch
+        batch_start.assign(tf.random.uniform(shape=(), minval=0, maxval=random_limit, dtype=tf.int32))
+        batch_end.assign(batch_start + batch_size)
+
+        # Make batch prediction for the whole population
+        predictions = population_model(x[batch_start:batch_end])
+
+        # Return one loss value per individual
+        sample_losses = loss(y[batch_start:batch_end], predictions)
+        return tf.reduce_mean(sample_losses, axis=-1)
+
+    return batched_fitness_fn
+
+
 def update_individual_fitness(
         model_weights,
         model_fitness_fn,
@@ -82,6 +133,7 @@ def update_individual_fitness(
     * The function replaces invalid weights with zeros.
     * The function assigns random weights to the individual if the fitness value is invalid.
     * Invalid weights and fitness values inlude `nan`, `inf` and `-inf`.
+    * Weights are cast to the model's dtype on assignment, so reduced-precision models keep full-precision master weights in the population.
     """
 
     # Print debug information
@@ -96,7 +148,7 @@ def update_individual_fitness(
                                             tf.random.normal(p[individual_index].shape, 0, deviation)))
 
         # Assign test weights to model
-        mw.assign(p[individual_index])
+        mw.assign(tf.cast(p[individual_index], mw.dtype))
     
     # Update fitness value
     fitness_values[individual_index].assign(model_fitness_fn())
@@ -111,12 +163,72 @@ def update_individual_fitness(
             p[individual_index].assign(tf.random.normal(p[individual_index].shape, 0, deviation))
 
             # Assign test weights to model
-            mw.assign(p[individual_index])
+            mw.assign(tf.cast(p[individual_index], mw.dtype))
         
         # Update fitness value
         fitness_values[individual_index].assign(model_fitness_fn())
 
 
+def update_individual_fitness_flat(
+        model_weights,
+        model_fitness_fn,
+        fitness_values,
+        population,
+        individual_index,
+        deviation=0.1
+    ):
+    """
+    Updates the fitness value of an individual in a flattened population.
+
+    Args:
+        model_weights: `list` of `tf.Variable` - List of model weights.
+        model_fitness_fn: `tf.function` - Fitness function generated by `metaopts.create_fitness`.
+        fitness_values: `tf.Variable` - Fitness values of the population.
+        population: `tf.Variable` - Population weights flattened to shape `(population_size, total_dim)`.
+        individual_index: `int` - Index of the individual in the population.
+        deviation: `float` - Standard deviation of the normal distribution used to generate random weights.
+
+    Notes:
+
+    * The function replaces invalid weights with random values.
+    * The function assigns random weights to the individual if the fitness value is invalid.
+    * Invalid weights and fitness values inlude `nan`, `inf` and `-inf`.
+    * Weights are cast to the model's dtype on assignment, so reduced-precision models keep full-precision master weights in the population.
+    """
+
+    # Print debug information
+    print_function_trace('update_individual_fitness_flat')
+
+    # Number of scalar weights per model weight tensor
+    weight_sizes = [weights.shape.num_elements() for weights in model_weights]
+
+    # Replace invalid weights with random values
+    individual = population[individual_index]
+    population[individual_index].assign(tf.where(tf.math.is_finite(individual),
+                                                 individual,
+                                                 tf.random.normal(individual.shape, 0, deviation)))
+
+    # Assign test weights to model
+    for mw, weights in zip(model_weights, tf.split(population[individual_index], weight_sizes)):
+        mw.assign(tf.cast(tf.reshape(weights, mw.shape), mw.dtype))
+
+    # Update fitness value
+    fitness_values[individual_index].assign(model_fitness_fn())
+
+    # If fitness value is invalid
+    if tf.logical_not(tf.math.is_finite(fitness_values[individual_index])):
+
+        # Assign random weights to individual
+        population[individual_index].assign(tf.random.normal(individual.shape, 0, deviation))
+
+        # Assign test weights to model
+        for mw, weights in zip(model_weights, tf.split(population[individual_index], weight_sizes)):
+            mw.assign(tf.cast(tf.reshape(weights, mw.shape), mw.dtype))
+
+        # Update fitness value
+        fitness_values[individual_index].assign(model_fitness_fn())
+
+
 def update_population_fitness(
         model_weights,
         model_fitness_fn,
@@ -141,6 +253,7 @@ def update_population_fitness(
     * The function replaces invalid weights with zeros.
     * The function assigns random weights to the individual if the fitness value is invalid.
     * Invalid weights and fitness values inlude `nan`, `inf` and `-inf`.
+    * Weights are cast to the model's dtype on assignment, so reduced-precision models keep full-precision master weights in the population.
     """
 
     # Print debug information
@@ -160,5 +273,76 @@ def update_population_fitness(
         )
 
 
+def update_population_fitness_flat(
+        model_weights,
+        model_fitness_fn,
+        fitness_values,
+        population,
+        population_size,
+        deviation=0.1
+    ):
+    """
+    Updates the fitness value of each individual in a flattened population.
+
+    Args:
+        model_weights: `list` of `tf.Variable` - List of model weights.
+        model_fitness_fn: `tf.function` - Fitness function generated by `metaopts.create_fitness`.
+        fitness_values: `tf.Variable` - Fitness values of the population.
+        population: `tf.Variable` - Population weights flattened to shape `(population_size, total_dim)`.
+        population_size: `int` - Number of individuals in the population.
+        deviation: `float` - Standard deviation of the normal distribution used to generate random weights.
+
+    Notes:
+
+    * The function replaces invalid weights with random values.
+    * The function assigns random weights to the individual if the fitness value is invalid.
+    * Invalid weights and fitness values inlude `nan`, `inf` and `-inf`.
+    * Weights are cast to the model's dtype on assignment, so reduced-precision models keep full-precision master weights in the population.
+    """
+
+    # Print debug information
+    print_function_trace('update_population_fitness_flat')
+
+    # Loop over individuals
+    for i in tf.range(population_size):
+
+        # Update individual fitness
+        update_individual_fitness_flat(
+            model_weights,
+            model_fitness_fn,
+            fitness_values,
+            population,
+            i,
+            deviation
+        )
+
+
+def update_population_fitness_batched(
+        model_fitness_fn,
+        fitness_values
+    ):
+    """
+    Updates the fitness values of the whole population with a single batched evaluation.
+
+    Args:
+        model_fitness_fn: `tf.function` - Fitness function generated by `metaopts.create_batched_fitness_function`.
+        fitness_values: `tf.Variable` - Fitness values of the population.
+
+    Notes:
+
+    * The population is evaluated in one forward pass instead of one pass per individual.
+    * Invalid fitness values (`nan`, `inf` and `-inf`) are not replaced, so the caller is responsible for handling them.
+    """
+
+    # Print debug information
+    print_function_trace('update_population_fitness_batched')
+
+    # Update all fitness values at once
+    fitness_values.assign(model_fitness_fn())
+
+
 update_individual_fitness = tf.function(update_individual_fitness)
 update_population_fitness = tf.function(update_population_fitness)
+update_individual_fitness_flat = tf.function(update_individual_fitness_flat)
+update_population_fitness_flat = tf.function(update_population_fitness_flat)
+update_population_fitness_batched = tf.function(update_population_fitness_batched)
@@ -3,6 +3,7 @@
 import tensorflow as tf
 from .print import print_function_trace
 from .fitness import update_population_fitness
+from .fitness import update_population_fitness_flat
 
 
 def create_population(
@@ -30,6 +31,37 @@ def create_population(
     return [tf.Variable(tf.repeat([tf.random.normal(weights.shape, 0, deviation)], population_size, axis=0)) for weights in model_weights]
 
 
+def create_flat_population(
+        model_weights,
+        population_size,
+        transfer_learning=False,
+        deviation=0.1
+    ):
+    """
+    Creates a population of individuals with all model weights flattened into a single axis.
+
+    Args:
+        model_weights: `list` of `tf.Variable` - List of model weights.
+        population_size: `int` - Number of individuals in the population.
+        transfer_learning: `bool` - Whether to copy current model weights or generate random ones.
+        deviation: `float` - Standard deviation of the normal distribution used to generate random weights.
+
+    Notes:
+
+    * The returned population has shape `(population_size, total_dim)` where `total_dim` is the total number of scalar model weights.
+    """
+
+    if transfer_learning:
+
+        # Return a population of individuals with the same weights as the model
+        flat_weights = tf.concat([tf.reshape(weights, (-1,)) for weights in model_weights], axis=0)
+        return tf.Variable(tf.repeat([flat_weights], population_size, axis=0))
+
+    # Return a population of individuals with random weights
+    total_dim = sum(weights.shape.num_elements() for weights in model_weights)
+    return tf.Variable(tf.repeat([tf.random.normal((total_dim,), 0, deviation)], population_size, axis=0))
+
+
 def sort_population(
         population,
         fitness_values
@@ -86,7 +118,48 @@ def apply_best_solution(
 
     # Apply best solution to the model
     for mw, p in zip(model_weights, population):
-        mw.assign(p[best_solution_index])
+        mw.assign(tf.cast(p[best_solution_index], mw.dtype))
+
+    # Print debug information
+    print('Best solution applied to model.')
+
+
+def apply_best_solution_flat(
+        model_weights,
+        model_fitness_fn,
+        fitness_values,
+        population,
+        population_size
+    ):
+    """
+    Applies the best solution of a flattened population to the model.
+
+    Args:
+        model_weights: `list` of `tf.Variable` - List of model weights.
+        model_fitness_fn: `tf.function` - Fitness function generated by `metaopts.create_fitness`.
+        fitness_values: `tf.Variable` - Fitness values of the population.
+        population: `tf.Variable` - Population weights flattened to shape `(population_size, total_dim)`.
+        population_size: `int` - Number of individuals in the population.
+    """
+
+    # Update fitness values
+    update_population_fitness_flat(
+        model_weights,
+        model_fitness_fn,
+        fitness_values,
+        population,
+        population_size
+    )
+
+    # Best solution index
+    best_solution_index = tf.argmin(fitness_values)
+
+    # Number of scalar weights per model weight tensor
+    weight_sizes = [weights.shape.num_elements() for weights in model_weights]
+
+    # Apply best solution to the model
+    for mw, weights in zip(model_weights, tf.split(population[best_solution_index], weight_sizes)):
+        mw.assign(tf.cast(tf.reshape(weights, mw.shape), mw.dtype))
 
     # Print debug information
     print('Best solution applied to model.')
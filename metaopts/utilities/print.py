@@ -7,6 +7,11 @@ def print_function_trace(tf_function_name):
 
     Args:
         tf_function_name: `str` - Name of the `@tf.function` that is being traced.
+
+    Notes:
+
+    * This is a Python `print`, not a `tf.print`, so it only runs while the function is being traced.
+    * No ops are emitted into the graph, so calling it in a `@tf.function` body costs nothing at execution time.
     """
 
     print('Tracing {0}...'.format(tf_function_name))